@@ -0,0 +1,133 @@
+"""
+On-disk JSON cache for English Buddy.
+Stores results under ~/.english-buddy/cache/ to avoid repeated work.
+"""
+
+import functools
+import hashlib
+import json
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+
+# Cache location
+CACHE_DIR = Path.home() / ".english-buddy" / "cache"
+
+
+def cache_key(text: str) -> str:
+    """Hash text into a short, filename-safe cache key."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def load_cached(name: str, max_age: float) -> Optional[dict]:
+    """
+    Load a cached entry if it exists and is fresh.
+
+    Args:
+        name: Cache entry name (without extension)
+        max_age: Maximum age in seconds
+
+    Returns:
+        Cached data, or None if missing, expired or unreadable
+    """
+    path = CACHE_DIR / f"{name}.json"
+    try:
+        if time.time() - path.stat().st_mtime > max_age:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def save_cached(name: str, data: dict):
+    """Write a cache entry, ignoring failures (the cache is best-effort)."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(CACHE_DIR / f"{name}.json", 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"Failed to write cache: {e}", file=__import__('sys').stderr)
+
+
+def prune_cached(prefix: str, max_age: float):
+    """
+    Delete cache entries starting with prefix that are older than max_age.
+
+    load_cached() only ignores stale entries, so without pruning they
+    would pile up on disk (along with the prompt text they describe).
+    """
+    cutoff = time.time() - max_age
+    try:
+        paths = list(CACHE_DIR.glob(f"{prefix}*.json"))
+    except OSError:
+        return
+    for path in paths:
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+
+def end_of_day_plus_grace(grace_seconds: int = 300) -> float:
+    """Get the Unix time of the coming midnight plus a grace period."""
+    midnight = datetime.combine(date.today() + timedelta(days=1), datetime.min.time())
+    return midnight.timestamp() + grace_seconds
+
+
+def _file_stamp(path: Path) -> list:
+    """
+    Fingerprint a SQLite database file and its WAL.
+
+    In WAL mode writes land in the -wal file until a checkpoint, so the main
+    file's mtime alone would miss them. An empty WAL (a reader is connected)
+    counts the same as a missing one (no connection open).
+    """
+    stamp = []
+    for candidate in (path, path.with_name(path.name + "-wal")):
+        try:
+            st = candidate.stat()
+            stamp.append([st.st_mtime_ns, st.st_size] if st.st_size else None)
+        except OSError:
+            stamp.append(None)
+    return stamp
+
+
+def disk_cached(invalidate_on: Path, ttl_fn=end_of_day_plus_grace):
+    """
+    Cache a function's JSON-serializable result on disk.
+
+    A cached result is reused while the day is unchanged, invalidate_on
+    (a database file) has not been written, and ttl_fn()'s expiry time
+    has not passed. Results depending on "today" therefore never leak
+    into the next day.
+
+    Results always come back in their JSON form (tuples become lists),
+    whether or not they were served from the cache.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            call = json.dumps([args, kwargs], sort_keys=True, default=str)
+            name = f"stats-{func.__name__}-{cache_key(call)}"
+            stamp = [date.today().isoformat(), _file_stamp(invalidate_on)]
+
+            entry = load_cached(name, max_age=float('inf'))
+            if entry and entry.get("stamp") == stamp and entry.get("expires", 0) > time.time():
+                return entry["value"]
+
+            value = json.loads(json.dumps(func(*args, **kwargs)))
+            # Saved under the stamp taken before the call: a write that lands
+            # while func runs then invalidates this entry instead of hiding
+            # behind it (a call that creates the database just misses once)
+            save_cached(name, {
+                "stamp": stamp,
+                "expires": ttl_fn(),
+                "value": value
+            })
+            return value
+        return wrapper
+    return decorator
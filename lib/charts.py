@@ -4,6 +4,12 @@ Creates terminal-friendly visualizations.
 """
 
 
+# Series shorter than this are rendered in pure Python (see _trend_rows).
+# Bar charts always are: they have one bar per error category, far below
+# the point where importing NumPy pays for itself
+_NUMPY_MIN_POINTS = 16
+
+
 def ascii_bar_chart(data: dict, title: str = "", width: int = 40) -> str:
     """
     Generate an ASCII horizontal bar chart.
@@ -19,40 +25,59 @@ def ascii_bar_chart(data: dict, title: str = "", width: int = 40) -> str:
     if not data:
         return "No data available"
 
-    lines = []
-
-    if title:
-        lines.append(title)
-        lines.append("━" * len(title))
+    header = f"{title}\n{'━' * len(title)}\n" if title else ""
 
     # Find max value for scaling
-    max_value = max(data.values()) if data.values() else 1
+    max_value = max(data.values())
     total = sum(data.values())
 
     # Find max label length for alignment
     max_label_len = max(len(str(k)) for k in data.keys())
 
-    for label, value in data.items():
-        # Calculate bar length
-        if max_value > 0:
-            bar_len = int((value / max_value) * width)
-        else:
-            bar_len = 0
+    return header + "\n".join(
+        f"{str(label).ljust(max_label_len)}  {'█' * _bar_length(value, max_value, width)} {value} ({_percent(value, total):.0f}%)"
+        for label, value in data.items()
+    )
 
-        # Calculate percentage
-        if total > 0:
-            pct = (value / total) * 100
-        else:
-            pct = 0
 
-        # Create bar
-        bar = "█" * bar_len
+def _bar_length(value, max_value, width: int) -> int:
+    """Scale a value to a bar length (empty when nothing is positive)."""
+    if max_value > 0:
+        return int((value / max_value) * width)
+    return 0
 
-        # Format line
-        label_padded = str(label).ljust(max_label_len)
-        lines.append(f"{label_padded}  {bar} {value} ({pct:.0f}%)")
 
-    return "\n".join(lines)
+def _percent(value, total) -> float:
+    """Get value as a percentage of total (0 when the total is not positive)."""
+    if total > 0:
+        return (value / total) * 100
+    return 0
+
+
+def _trend_rows(values: list, min_val, max_val, height: int) -> list:
+    """
+    Render the filled cells of a trend chart, top row first.
+
+    Long series use one broadcast NumPy comparison when NumPy is installed;
+    short ones (the usual 7-day chart) stay in pure Python, where importing
+    and wrapping into arrays would cost more than it saves.
+    """
+    if len(values) >= _NUMPY_MIN_POINTS:
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        if np is not None:
+            arr = np.asarray(values, dtype=np.float64)
+            thresholds = min_val + (max_val - min_val) * (np.arange(height, 0, -1) / height)
+            cells = np.where(arr[None, :] >= thresholds[:, None], "█", " ")
+            return ["".join(row) for row in cells]
+
+    rows = []
+    for row in range(height, 0, -1):
+        threshold = min_val + (max_val - min_val) * (row / height)
+        rows.append("".join("█" if val >= threshold else " " for val in values))
+    return rows
 
 
 def ascii_trend_chart(data: list, title: str = "", height: int = 8) -> str:
@@ -83,14 +108,7 @@ def ascii_trend_chart(data: list, title: str = "", height: int = 8) -> str:
     min_val = min(values) if values else 0
 
     # Build the chart rows
-    for row in range(height, 0, -1):
-        threshold = min_val + (max_val - min_val) * (row / height)
-        line = ""
-        for val in values:
-            if val >= threshold:
-                line += "█"
-            else:
-                line += " "
+    for row, line in zip(range(height, 0, -1), _trend_rows(values, min_val, max_val, height)):
         # Add Y-axis label for top and bottom
         if row == height:
             lines.append(f"{max_val:>4} │{line}")
@@ -103,10 +121,7 @@ def ascii_trend_chart(data: list, title: str = "", height: int = 8) -> str:
     lines.append("     └" + "─" * len(values))
 
     # Labels (abbreviated)
-    label_line = "      "
-    for label in labels:
-        label_line += label[0] if label else " "
-    lines.append(label_line)
+    lines.append("      " + "".join(label[0] if label else " " for label in labels))
 
     return "\n".join(lines)
 
@@ -144,27 +159,19 @@ def summary_box(title: str, items: list) -> str:
     Returns:
         Formatted box string
     """
-    lines = []
-
     # Calculate width
     max_item_len = max(len(str(item)) for item in items) if items else 0
     width = max(len(title), max_item_len) + 4
-
-    # Top border
-    lines.append("┌" + "─" * width + "┐")
-
-    # Title
-    lines.append("│ " + title.center(width - 2) + " │")
-    lines.append("├" + "─" * width + "┤")
-
-    # Items
-    for item in items:
-        lines.append("│ " + str(item).ljust(width - 2) + " │")
-
-    # Bottom border
-    lines.append("└" + "─" * width + "┘")
-
-    return "\n".join(lines)
+    inner_width = width - 2
+    hline = "─" * width
+
+    return "\n".join([
+        f"┌{hline}┐",
+        f"│ {title.center(inner_width)} │",
+        f"├{hline}┤",
+        *(f"│ {str(item).ljust(inner_width)} │" for item in items),
+        f"└{hline}┘",
+    ])
 
 
 if __name__ == "__main__":
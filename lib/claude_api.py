@@ -3,6 +3,7 @@ Claude API integration for English Buddy.
 Uses Claude Haiku for grammar checking.
 """
 
+import functools
 import json
 import os
 import re
@@ -10,20 +11,88 @@ from pathlib import Path
 from typing import Optional
 
 
+# KEY=value lines of a .env file (comments and blank lines never match)
+_ENV_RE = re.compile(r'^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=(.*)$', re.M)
+
+
+@functools.lru_cache(maxsize=1)
 def load_env_file():
-    """Load environment variables from ~/.claude/.env"""
+    """Load environment variables from ~/.claude/.env (once per process)"""
     env_path = Path.home() / ".claude" / ".env"
-    if env_path.exists():
-        with open(env_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ.setdefault(key.strip(), value.strip())
+    try:
+        content = env_path.read_text()
+    except OSError:
+        return
+    for match in _ENV_RE.finditer(content):
+        os.environ.setdefault(match.group(1), match.group(2).strip())
+
+
+# Anthropic client, kept for reuse by long-running processes (the daemon)
+_CLIENT = None
+
+# Tool the model is forced to call, so the analysis arrives as parsed JSON
+GRAMMAR_REPORT_TOOL = {
+    "name": "report_grammar",
+    "description": "Report the grammar analysis of the user's English text.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "has_errors": {"type": "boolean"},
+            "user_text": {
+                "type": "string",
+                "description": "Only the user's own words extracted from the message (exclude pasted content)"
+            },
+            "errors": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "original": {"type": "string", "description": "Wrong text"},
+                        "correction": {"type": "string", "description": "Correct text"},
+                        "explanation": {"type": "string", "description": "Brief reason"},
+                        "category": {
+                            "type": "string",
+                            "enum": ["spelling", "grammar", "style", "vocabulary"]
+                        }
+                    },
+                    "required": ["original", "correction", "explanation", "category"]
+                }
+            },
+            "better_expression": {
+                "type": ["string", "null"],
+                "description": "Improved version of the user's text only, or null if the original is good"
+            },
+            "summary": {"type": "string", "description": "One line summary in Chinese"},
+            "skipped": {"type": "boolean"}
+        },
+        "required": ["has_errors", "user_text", "errors", "better_expression", "summary", "skipped"]
+    }
+}
+
+
+def parse_json_text(text: str) -> Optional[dict]:
+    """Parse a JSON object from model text, tolerating surrounding prose."""
+    start = text.find('{')
+    end = text.rfind('}')
+    if start == -1 or end < start:
+        return None
+    try:
+        return json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return None
 
 
-# Load .env at module import
-load_env_file()
+def is_valid_analysis(analysis) -> bool:
+    """Check an analysis has every report_grammar field and well-formed errors."""
+    if not isinstance(analysis, dict):
+        return False
+    if any(key not in analysis for key in GRAMMAR_REPORT_TOOL["input_schema"]["required"]):
+        return False
+    errors = analysis["errors"]
+    return isinstance(errors, list) and all(
+        isinstance(err, dict) and "original" in err and "correction" in err
+        for err in errors
+    )
 
 
 def analyze_grammar(user_message: str) -> Optional[dict]:
@@ -38,18 +107,22 @@ def analyze_grammar(user_message: str) -> Optional[dict]:
     - summary: str (Chinese summary)
     - skipped: bool
     """
+    load_env_file()
+
     try:
         import anthropic
     except ImportError:
         print("Error: anthropic package not installed", file=__import__('sys').stderr)
         return None
 
-    api_key = os.environ.get('ANTHROPIC_API_KEY')
-    if not api_key:
-        print("Error: ANTHROPIC_API_KEY not set", file=__import__('sys').stderr)
-        return None
-
-    client = anthropic.Anthropic(api_key=api_key)
+    global _CLIENT
+    if _CLIENT is None:
+        api_key = os.environ.get('ANTHROPIC_API_KEY')
+        if not api_key:
+            print("Error: ANTHROPIC_API_KEY not set", file=__import__('sys').stderr)
+            return None
+        _CLIENT = anthropic.Anthropic(api_key=api_key)
+    client = _CLIENT
 
     prompt = f"""Analyze the following ENGLISH text for grammar errors and suggest better expressions.
 
@@ -57,17 +130,7 @@ IMPORTANT: This tool is ONLY for checking English grammar. If the text contains
 
 Text: "{user_message}"
 
-Respond in this exact JSON format (no markdown code blocks):
-{{
-  "has_errors": true/false,
-  "user_text": "only the user's own words extracted from the message (exclude pasted content)",
-  "errors": [
-    {{"original": "wrong text", "correction": "correct text", "explanation": "brief reason", "category": "spelling|grammar|style|vocabulary"}}
-  ],
-  "better_expression": "improved version of user's text only (or null if original is good)",
-  "summary": "one line summary in Chinese",
-  "skipped": true/false
-}}
+Report your analysis by calling the report_grammar tool.
 
 IMPORTANT - Focus on USER'S OWN WORDS only:
 - If the message contains BOTH user's own text AND pasted content (logs, commands, code, terminal output), ONLY check the user's own text
@@ -104,22 +167,34 @@ Rules for normal text:
         response = client.messages.create(
             model="claude-3-5-haiku-latest",
             max_tokens=500,
+            tools=[GRAMMAR_REPORT_TOOL],
+            tool_choice={"type": "tool", "name": GRAMMAR_REPORT_TOOL["name"]},
             messages=[{"role": "user", "content": prompt}]
         )
-        result_text = response.content[0].text.strip()
-
-        # Try to parse JSON
-        try:
-            return json.loads(result_text)
-        except json.JSONDecodeError:
-            # Try to extract JSON from response
-            match = re.search(r'\{[\s\S]*\}', result_text)
-            if match:
-                try:
-                    return json.loads(match.group())
-                except json.JSONDecodeError:
-                    pass
+
+        # A reply cut off at max_tokens is incomplete; returning None sends
+        # the prompt to the retry queue instead of caching a partial analysis
+        if response.stop_reason == "max_tokens":
+            print("API error: response truncated at max_tokens", file=__import__('sys').stderr)
+            return None
+
+        # The forced tool call carries the analysis as an already-parsed dict,
+        # otherwise fall back to JSON in a text reply
+        analysis = None
+        for block in response.content:
+            if block.type == "tool_use":
+                analysis = block.input
+                break
+        else:
+            for block in response.content:
+                if block.type == "text":
+                    analysis = parse_json_text(block.text)
+                    break
+
+        if not is_valid_analysis(analysis):
+            print("API error: incomplete grammar analysis", file=__import__('sys').stderr)
             return None
+        return analysis
 
     except Exception as e:
         print(f"API error: {e}", file=__import__('sys').stderr)
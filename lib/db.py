@@ -3,29 +3,86 @@ SQLite database module for English Buddy.
 Stores grammar corrections and statistics.
 """
 
+import atexit
 import sqlite3
-from datetime import datetime, date
+from collections import Counter, defaultdict
+from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Optional
 
+from cache import disk_cached
+
 
 # Database location
 DB_PATH = Path.home() / ".english-buddy" / "data.sqlite"
 
+# Error categories tracked in daily_stats
+CATEGORIES = ("spelling", "grammar", "style", "vocabulary")
+
+# Column order used when reading rows as plain tuples
+_CORRECTION_COLS = ("id", "timestamp", "original_text", "user_text", "better_expression", "summary")
+_ERROR_COLS = ("id", "correction_id", "original", "correction", "explanation", "category")
+
+# Bump when init_db() gains tables, indexes or persistent pragmas so
+# existing databases upgrade
+SCHEMA_VERSION = 3
+
+# Process-wide connection, reused so SQLite can cache prepared statements
+_CONN: Optional[sqlite3.Connection] = None
+_initialized = False
+
+
+def _connect() -> sqlite3.Connection:
+    """Get the shared database connection, opening it if needed."""
+    global _CONN
+    if _CONN is None:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _CONN = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+        _CONN.row_factory = sqlite3.Row
+        # Per-connection settings; journal_mode=WAL is persistent and set in init_db()
+        _CONN.execute("PRAGMA synchronous=NORMAL")
+        _CONN.execute("PRAGMA temp_store=MEMORY")
+        _CONN.execute("PRAGMA mmap_size=268435456")
+        _CONN.execute("PRAGMA cache_size=-32000")
+        atexit.register(_close_connection)
+    return _CONN
+
 
 def get_connection() -> sqlite3.Connection:
-    """Get database connection, creating DB if needed."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    """Get the shared database connection, creating DB and tables if needed."""
+    conn = _connect()
+    # Retried on every call until it succeeds (e.g. after a locked database)
+    if not _initialized:
+        init_db()
     return conn
 
 
+def _close_connection():
+    """Refresh planner statistics if SQLite thinks they are stale, then close."""
+    try:
+        _CONN.execute("PRAGMA optimize")
+    except sqlite3.Error:
+        pass
+    _CONN.close()
+
+
 def init_db():
-    """Initialize database tables."""
-    conn = get_connection()
+    """Initialize database tables (once per process, skipped if up to date)."""
+    global _initialized
+    if _initialized:
+        return
+
+    conn = _connect()
     cursor = conn.cursor()
 
+    # Already at the current schema: skip the CREATE statements entirely
+    if cursor.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        _initialized = True
+        return
+
+    # WAL is stored in the database file, so switching once is enough
+    cursor.execute("PRAGMA journal_mode=WAL")
+
     # Corrections table
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS corrections (
@@ -63,8 +120,64 @@ def init_db():
         )
     """)
 
+    # Indexes for the per-day correction lookups. errors(correction_id,
+    # category) also covers the per-category counts, so it replaces the
+    # earlier single-column index on correction_id
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_corrections_ts ON corrections(timestamp)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_errors_correction_category ON errors(correction_id, category)
+    """)
+    cursor.execute("DROP INDEX IF EXISTS idx_errors_correction")
+
+    # Index for grouping errors by (original, correction) in get_top_errors
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_errors_original ON errors(original, correction)
+    """)
+
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.commit()
-    conn.close()
+    # Only now: if anything above failed, the next get_connection() retries
+    _initialized = True
+
+
+# Write statements shared by save_correction and save_corrections_bulk
+_INSERT_CORRECTION = """
+    INSERT INTO corrections (timestamp, original_text, user_text, better_expression, summary)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_INSERT_ERROR = """
+    INSERT INTO errors (correction_id, original, correction, explanation, category)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_UPSERT_DAILY_STATS = """
+    INSERT INTO daily_stats (date, total_corrections, spelling_count, grammar_count, style_count, vocabulary_count)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(date) DO UPDATE SET
+        total_corrections = total_corrections + excluded.total_corrections,
+        spelling_count = spelling_count + excluded.spelling_count,
+        grammar_count = grammar_count + excluded.grammar_count,
+        style_count = style_count + excluded.style_count,
+        vocabulary_count = vocabulary_count + excluded.vocabulary_count
+"""
+
+
+def _normalize_category(error: dict) -> str:
+    """Get an error's category, folding unknown ones into grammar."""
+    category = error.get("category", "grammar").lower()
+    return category if category in CATEGORIES else "grammar"
+
+
+def _error_row(correction_id: int, error: dict, category: str) -> tuple:
+    """Build the errors-table row for one error dict."""
+    return (
+        correction_id,
+        error.get("original", ""),
+        error.get("correction", ""),
+        error.get("explanation", ""),
+        category
+    )
 
 
 def save_correction(
@@ -87,71 +200,100 @@ def save_correction(
     Returns:
         correction_id
     """
-    init_db()
     conn = get_connection()
-    cursor = conn.cursor()
-
     timestamp = datetime.now().isoformat()
 
-    # Insert correction
-    cursor.execute("""
-        INSERT INTO corrections (timestamp, original_text, user_text, better_expression, summary)
-        VALUES (?, ?, ?, ?, ?)
-    """, (timestamp, original_text, user_text, better_expression, summary))
+    categories = [_normalize_category(error) for error in errors]
+    category_counts = Counter(categories)
 
-    correction_id = cursor.lastrowid
+    # One transaction for the correction, its errors and the daily stats
+    with conn:
+        cursor = conn.cursor()
 
-    # Insert errors
-    category_counts = {"spelling": 0, "grammar": 0, "style": 0, "vocabulary": 0}
-    for error in errors:
-        category = error.get("category", "grammar").lower()
-        if category not in category_counts:
-            category = "grammar"
-        category_counts[category] += 1
+        # Insert correction
+        cursor.execute(_INSERT_CORRECTION, (timestamp, original_text, user_text, better_expression, summary))
 
-        cursor.execute("""
-            INSERT INTO errors (correction_id, original, correction, explanation, category)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            correction_id,
-            error.get("original", ""),
-            error.get("correction", ""),
-            error.get("explanation", ""),
-            category
-        ))
+        correction_id = cursor.lastrowid
 
-    # Update daily stats
-    today = date.today().isoformat()
-    cursor.execute("""
-        INSERT INTO daily_stats (date, total_corrections, spelling_count, grammar_count, style_count, vocabulary_count)
-        VALUES (?, 1, ?, ?, ?, ?)
-        ON CONFLICT(date) DO UPDATE SET
-            total_corrections = total_corrections + 1,
-            spelling_count = spelling_count + ?,
-            grammar_count = grammar_count + ?,
-            style_count = style_count + ?,
-            vocabulary_count = vocabulary_count + ?
-    """, (
-        today,
-        category_counts["spelling"],
-        category_counts["grammar"],
-        category_counts["style"],
-        category_counts["vocabulary"],
-        category_counts["spelling"],
-        category_counts["grammar"],
-        category_counts["style"],
-        category_counts["vocabulary"]
-    ))
+        # Insert errors
+        cursor.executemany(_INSERT_ERROR, [
+            _error_row(correction_id, error, category)
+            for error, category in zip(errors, categories)
+        ])
 
-    conn.commit()
-    conn.close()
+        # Update daily stats
+        today = date.today().isoformat()
+        cursor.execute(_UPSERT_DAILY_STATS, (today, 1, *(category_counts[c] for c in CATEGORIES)))
 
     return correction_id
 
 
+def save_corrections_bulk(records: list) -> list:
+    """
+    Save many corrections in a single transaction (e.g. replaying old logs).
+
+    Args:
+        records: List of dicts with the save_correction arguments as keys
+            (original_text, user_text, errors, better_expression, summary)
+            plus an optional ISO "timestamp" (defaults to now)
+
+    Returns:
+        List of correction_ids, in the order of records
+    """
+    if not records:
+        return []
+
+    conn = get_connection()
+    now = datetime.now().isoformat()
+
+    correction_rows = []
+    for record in records:
+        correction_rows.append((
+            record.get("timestamp") or now,
+            record.get("original_text"),
+            record.get("user_text"),
+            record.get("better_expression"),
+            record.get("summary")
+        ))
+
+    with conn:
+        # Take the write lock up front so no other writer can claim ids
+        # between reading the sequence and inserting
+        conn.execute("BEGIN IMMEDIATE")
+        cursor = conn.cursor()
+
+        # AUTOINCREMENT hands out ids after the sqlite_sequence value, one
+        # per inserted row, so the new ids are contiguous from there
+        row = cursor.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'corrections'"
+        ).fetchone()
+        first_id = (row["seq"] if row else 0) + 1
+        cursor.executemany(_INSERT_CORRECTION, correction_rows)
+        correction_ids = list(range(first_id, first_id + len(correction_rows)))
+
+        # Errors for every record, plus per-day totals aggregated in Python
+        error_rows = []
+        day_counts = defaultdict(Counter)
+        for correction_id, record, (timestamp, *_) in zip(correction_ids, records, correction_rows):
+            day = day_counts[timestamp[:10]]
+            day["total"] += 1
+            for error in record.get("errors") or []:
+                category = _normalize_category(error)
+                day[category] += 1
+                error_rows.append(_error_row(correction_id, error, category))
+
+        cursor.executemany(_INSERT_ERROR, error_rows)
+        cursor.executemany(_UPSERT_DAILY_STATS, [
+            (day, counts["total"], *(counts[c] for c in CATEGORIES))
+            for day, counts in day_counts.items()
+        ])
+
+    return correction_ids
+
+
+@disk_cached(invalidate_on=DB_PATH)
 def get_daily_stats(target_date: Optional[str] = None) -> dict:
     """Get statistics for a specific date (default: today)."""
-    init_db()
     if target_date is None:
         target_date = date.today().isoformat()
 
@@ -163,7 +305,6 @@ def get_daily_stats(target_date: Optional[str] = None) -> dict:
     """, (target_date,))
 
     row = cursor.fetchone()
-    conn.close()
 
     if row:
         return dict(row)
@@ -179,131 +320,259 @@ def get_daily_stats(target_date: Optional[str] = None) -> dict:
 
 def get_daily_corrections(target_date: Optional[str] = None) -> list:
     """Get all corrections for a specific date with their errors."""
-    init_db()
     if target_date is None:
         target_date = date.today().isoformat()
 
+    # Range on the raw ISO timestamp so the timestamp index can be used
+    day_start = target_date
+    day_end = (date.fromisoformat(target_date) + timedelta(days=1)).isoformat()
+
     conn = get_connection()
     cursor = conn.cursor()
+    # Plain tuples: dicts are built once below instead of Row -> dict copies
+    cursor.row_factory = None
 
     # Get corrections for the date
-    cursor.execute("""
-        SELECT * FROM corrections
-        WHERE date(timestamp) = ?
+    cursor.execute(f"""
+        SELECT {', '.join(_CORRECTION_COLS)} FROM corrections
+        WHERE timestamp >= ? AND timestamp < ?
         ORDER BY timestamp DESC
-    """, (target_date,))
-
-    corrections = []
+    """, (day_start, day_end))
+    corrections = [dict(zip(_CORRECTION_COLS, row)) for row in cursor.fetchall()]
+
+    # Get errors for all of them in one query
+    cursor.execute(f"""
+        SELECT {', '.join(_ERROR_COLS)} FROM errors
+        WHERE correction_id IN (
+            SELECT id FROM corrections WHERE timestamp >= ? AND timestamp < ?
+        )
+        ORDER BY id
+    """, (day_start, day_end))
+    errors_by_correction = defaultdict(list)
     for row in cursor.fetchall():
-        correction = dict(row)
+        errors_by_correction[row[1]].append(dict(zip(_ERROR_COLS, row)))
 
-        # Get errors for this correction
-        cursor.execute("""
-            SELECT * FROM errors WHERE correction_id = ?
-        """, (correction["id"],))
-        correction["errors"] = [dict(e) for e in cursor.fetchall()]
-        corrections.append(correction)
+    for correction in corrections:
+        correction["errors"] = errors_by_correction[correction["id"]]
 
-    conn.close()
     return corrections
 
 
-def get_weekly_stats(weeks_back: int = 0) -> dict:
-    """Get statistics for a specific week."""
-    init_db()
-    from datetime import timedelta
-
-    # Calculate week start (Monday) and end (Sunday)
+def _week_bounds(weeks_back: int = 0) -> tuple:
+    """Get (Monday, Sunday) dates of the week N weeks before this one."""
     today = date.today()
     start_of_week = today - timedelta(days=today.weekday() + 7 * weeks_back)
-    end_of_week = start_of_week + timedelta(days=6)
+    return start_of_week, start_of_week + timedelta(days=6)
+
+
+def _counts_from_row(row: sqlite3.Row, prefix: str) -> dict:
+    """Pick the prefixed total/category sums out of an aggregate row."""
+    counts = {"total_corrections": row[f"{prefix}_total"] or 0}
+    for category in CATEGORIES:
+        counts[f"{category}_count"] = row[f"{prefix}_{category}"] or 0
+    return counts
+
+
+# Both weeks in one range scan of daily_stats; prev_start..curr_end spans
+# exactly the two weeks, so everything before curr_start is last week
+_WEEK_PAIR_SQL = """
+    SELECT
+        SUM(CASE WHEN date >= :curr_start THEN total_corrections ELSE 0 END) AS curr_total,
+        SUM(CASE WHEN date >= :curr_start THEN spelling_count ELSE 0 END) AS curr_spelling,
+        SUM(CASE WHEN date >= :curr_start THEN grammar_count ELSE 0 END) AS curr_grammar,
+        SUM(CASE WHEN date >= :curr_start THEN style_count ELSE 0 END) AS curr_style,
+        SUM(CASE WHEN date >= :curr_start THEN vocabulary_count ELSE 0 END) AS curr_vocabulary,
+        SUM(CASE WHEN date < :curr_start THEN total_corrections ELSE 0 END) AS prev_total,
+        SUM(CASE WHEN date < :curr_start THEN spelling_count ELSE 0 END) AS prev_spelling,
+        SUM(CASE WHEN date < :curr_start THEN grammar_count ELSE 0 END) AS prev_grammar,
+        SUM(CASE WHEN date < :curr_start THEN style_count ELSE 0 END) AS prev_style,
+        SUM(CASE WHEN date < :curr_start THEN vocabulary_count ELSE 0 END) AS prev_vocabulary
+    FROM daily_stats
+    WHERE date BETWEEN :prev_start AND :curr_end
+"""
 
-    conn = get_connection()
-    cursor = conn.cursor()
 
-    cursor.execute("""
-        SELECT
-            COUNT(*) as total_corrections,
-            SUM(spelling_count) as spelling_count,
-            SUM(grammar_count) as grammar_count,
-            SUM(style_count) as style_count,
-            SUM(vocabulary_count) as vocabulary_count
-        FROM daily_stats
-        WHERE date BETWEEN ? AND ?
-    """, (start_of_week.isoformat(), end_of_week.isoformat()))
+def _week_pair_params() -> dict:
+    """Get the _WEEK_PAIR_SQL parameters for this week and last week."""
+    curr_start, curr_end = _week_bounds(0)
+    prev_start, _ = _week_bounds(1)
+    return {
+        "curr_start": curr_start.isoformat(),
+        "curr_end": curr_end.isoformat(),
+        "prev_start": prev_start.isoformat()
+    }
+
+
+@disk_cached(invalidate_on=DB_PATH)
+def get_week_pair_stats() -> dict:
+    """
+    Get this week's and last week's statistics in one query.
+
+    Returns a flat dict: curr_week_start, curr_week_end, prev_week_start,
+    prev_week_end, plus curr_/prev_ prefixed total_corrections and
+    <category>_count values.
+    """
+    curr_start, curr_end = _week_bounds(0)
+    prev_start, prev_end = _week_bounds(1)
 
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(_WEEK_PAIR_SQL, _week_pair_params())
     row = cursor.fetchone()
-    conn.close()
 
-    return {
-        "week_start": start_of_week.isoformat(),
-        "week_end": end_of_week.isoformat(),
-        "total_corrections": row["total_corrections"] or 0,
-        "spelling_count": row["spelling_count"] or 0,
-        "grammar_count": row["grammar_count"] or 0,
-        "style_count": row["style_count"] or 0,
-        "vocabulary_count": row["vocabulary_count"] or 0
+    stats = {
+        "curr_week_start": curr_start.isoformat(),
+        "curr_week_end": curr_end.isoformat(),
+        "prev_week_start": prev_start.isoformat(),
+        "prev_week_end": prev_end.isoformat()
     }
+    for prefix in ("curr", "prev"):
+        for key, value in _counts_from_row(row, prefix).items():
+            stats[f"{prefix}_{key}"] = value
+    return stats
 
 
-def get_top_errors(limit: int = 5, days: int = 7) -> list:
-    """Get most common errors in the last N days."""
-    init_db()
-    from datetime import timedelta
+# Position of e.category in CATEGORIES, for breaking ties in that order
+_CATEGORY_RANK_SQL = "CASE e.category {} ELSE {} END".format(
+    " ".join(f"WHEN '{category}' THEN {rank}" for rank, category in enumerate(CATEGORIES)),
+    len(CATEGORIES)
+)
 
-    start_date = (date.today() - timedelta(days=days)).isoformat()
+
+@disk_cached(invalidate_on=DB_PATH)
+def get_top_category(week_start: str, week_end: str) -> Optional[list]:
+    """
+    Get the most frequent error category between two dates (inclusive).
+
+    Ties go to the category listed first in CATEGORIES.
+
+    Returns:
+        [category, count], or None if there were no errors
+    """
+    day_after_end = (date.fromisoformat(week_end) + timedelta(days=1)).isoformat()
 
     conn = get_connection()
     cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT original, correction, category, COUNT(*) as count
+    cursor.execute(f"""
+        SELECT e.category, COUNT(*) as count
         FROM errors e
         JOIN corrections c ON e.correction_id = c.id
-        WHERE date(c.timestamp) >= ?
-        GROUP BY original, correction
-        ORDER BY count DESC
-        LIMIT ?
-    """, (start_date, limit))
+        WHERE c.timestamp >= ? AND c.timestamp < ?
+        GROUP BY e.category
+        ORDER BY count DESC, {_CATEGORY_RANK_SQL}
+        LIMIT 1
+    """, (week_start, day_after_end))
+
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return [row["category"], row["count"]]
+
+
+# One fixed statement text for every (limit, days) pair, so sqlite3's
+# statement cache prepares it once per connection. The cutoff is computed
+# by SQLite in local time, matching the local timestamps stored by
+# save_correction, and compared against the raw timestamp so the
+# timestamp index can be used
+_TOP_ERRORS_STMT = """
+    SELECT original, correction, category, COUNT(*) as count
+    FROM errors e
+    JOIN corrections c ON e.correction_id = c.id
+    WHERE c.timestamp >= date('now', 'localtime', printf('-%d days', ?))
+    GROUP BY original, correction
+    ORDER BY count DESC
+    LIMIT ?
+"""
 
-    errors = [dict(row) for row in cursor.fetchall()]
-    conn.close()
 
-    return errors
+def _query_top_errors(cursor: sqlite3.Cursor, limit: int, days: int) -> list:
+    """Run the most-common-errors query on an existing cursor."""
+    cursor.execute(_TOP_ERRORS_STMT, (days, limit))
+    return [dict(row) for row in cursor.fetchall()]
 
 
-def get_all_time_stats() -> dict:
-    """Get all-time statistics."""
-    init_db()
+@disk_cached(invalidate_on=DB_PATH)
+def get_top_errors(limit: int = 5, days: int = 7) -> list:
+    """Get most common errors in the last N days."""
+    conn = get_connection()
+    return _query_top_errors(conn.cursor(), limit, days)
+
+
+@disk_cached(invalidate_on=DB_PATH)
+def get_dashboard_bundle(top_errors_limit: int = 5, top_errors_days: int = 30, trend_days: int = 7) -> dict:
+    """
+    Get everything the stats and weekly reports show in one read transaction.
+
+    Returns dict with keys:
+    - all_time: total_days, total_corrections and <category>_count
+    - current_week, last_week: week_start, week_end, total_corrections
+      and <category>_count
+    - top_errors: same shape as get_top_errors()
+    - trend: list of [MM-DD, total_corrections] for the last trend_days days
+    """
+    cur_start, cur_end = _week_bounds(0)
+    prev_start, prev_end = _week_bounds(1)
+    trend_start = date.today() - timedelta(days=trend_days - 1)
+
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute("""
-        SELECT
-            COUNT(*) as total_days,
-            SUM(total_corrections) as total_corrections,
-            SUM(spelling_count) as spelling_count,
-            SUM(grammar_count) as grammar_count,
-            SUM(style_count) as style_count,
-            SUM(vocabulary_count) as vocabulary_count
-        FROM daily_stats
-    """)
+    # One snapshot for all queries
+    cursor.execute("BEGIN")
+    try:
+        cursor.execute(f"""
+            WITH
+            all_time AS (
+                SELECT
+                    COUNT(*) AS days,
+                    SUM(total_corrections) AS total,
+                    SUM(spelling_count) AS spelling,
+                    SUM(grammar_count) AS grammar,
+                    SUM(style_count) AS style,
+                    SUM(vocabulary_count) AS vocabulary
+                FROM daily_stats
+            ),
+            weeks AS ({_WEEK_PAIR_SQL})
+            SELECT
+                a.days AS all_days, a.total AS all_total,
+                a.spelling AS all_spelling, a.grammar AS all_grammar,
+                a.style AS all_style, a.vocabulary AS all_vocabulary,
+                w.*
+            FROM all_time a, weeks w
+        """, _week_pair_params())
+        row = cursor.fetchone()
+
+        top_errors = _query_top_errors(cursor, top_errors_limit, top_errors_days)
 
-    row = cursor.fetchone()
-    conn.close()
+        cursor.execute("""
+            SELECT date, total_corrections
+            FROM daily_stats
+            WHERE date >= ?
+            ORDER BY date
+        """, (trend_start.isoformat(),))
+        trend = [[r["date"][-5:], r["total_corrections"]] for r in cursor.fetchall()]
+    finally:
+        conn.commit()
 
     return {
-        "total_days": row["total_days"] or 0,
-        "total_corrections": row["total_corrections"] or 0,
-        "spelling_count": row["spelling_count"] or 0,
-        "grammar_count": row["grammar_count"] or 0,
-        "style_count": row["style_count"] or 0,
-        "vocabulary_count": row["vocabulary_count"] or 0
+        "all_time": {"total_days": row["all_days"] or 0, **_counts_from_row(row, "all")},
+        "current_week": {
+            "week_start": cur_start.isoformat(),
+            "week_end": cur_end.isoformat(),
+            **_counts_from_row(row, "curr")
+        },
+        "last_week": {
+            "week_start": prev_start.isoformat(),
+            "week_end": prev_end.isoformat(),
+            **_counts_from_row(row, "prev")
+        },
+        "top_errors": top_errors,
+        "trend": trend
     }
 
 
 if __name__ == "__main__":
     # Test the database
-    init_db()
+    get_connection()
     print(f"Database initialized at: {DB_PATH}")
     print(f"Today's stats: {get_daily_stats()}")
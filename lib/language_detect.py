@@ -6,25 +6,26 @@ Detects English vs Chinese text to filter messages.
 import re
 
 
-def contains_english(text: str) -> bool:
-    """Check if text contains English letters (at least 2 consecutive letters)."""
-    english_pattern = re.compile(r'[a-zA-Z]{2,}')
-    return bool(english_pattern.search(text))
+# Compiled once at import; matching runs in the C regex engine
+_ENGLISH_RE = re.compile(r'[a-zA-Z]{2,}')
+_LETTER_RE = re.compile(r'[a-zA-Z]')
+# Captures CJK characters and matches ASCII letters with an empty group,
+# so one findall() pass yields both counts
+_CLASS_RE = re.compile(r'([\u4e00-\u9fff])|[a-zA-Z]')  # CJK Unified Ideographs
 
+# Line prefixes typical of pasted shell sessions, quotes, logs, tracebacks
+# and code (any indentation counts)
+_PASTE_LINE_RE = re.compile(r'[/$>\[]|\s|Traceback \(most recent call last\)')
+# Lines ending like code statements or blocks
+_CODE_LINE_RE = re.compile(r'[{};]\s*$')
+_NON_SPACE_RE = re.compile(r'\S')
 
-def is_pure_chinese(text: str) -> bool:
-    """Check if text is pure Chinese (no English words)."""
-    # Remove punctuation, numbers, whitespace
-    cleaned = re.sub(r'[\s\d\W]+', '', text)
-    if not cleaned:
-        return True
-    # Check if all remaining chars are CJK
-    for char in cleaned:
-        if '\u4e00' <= char <= '\u9fff':  # CJK Unified Ideographs
-            continue
-        elif 'a' <= char.lower() <= 'z':
-            return False
-    return True
+
+def _count_letters(text: str) -> tuple:
+    """Count (chinese, english) characters in a single pass."""
+    matches = _CLASS_RE.findall(text)
+    english_count = matches.count('')
+    return len(matches) - english_count, english_count
 
 
 def is_primarily_chinese(text: str) -> bool:
@@ -32,14 +33,12 @@ def is_primarily_chinese(text: str) -> bool:
     Check if text is primarily Chinese (>30% Chinese characters).
     Used to skip mixed Chinese/English where Chinese is the main language.
     """
-    chinese_count = 0
-    english_count = 0
+    # ASCII-only text (typical for long pasted logs) cannot contain CJK, and
+    # str.isascii() is answered from the string header without a scan
+    if text.isascii():
+        return not _LETTER_RE.search(text)
 
-    for char in text:
-        if '\u4e00' <= char <= '\u9fff':  # CJK Unified Ideographs
-            chinese_count += 1
-        elif 'a' <= char.lower() <= 'z':
-            english_count += 1
+    chinese_count, english_count = _count_letters(text)
 
     # If no letters at all, skip
     if chinese_count + english_count == 0:
@@ -49,37 +48,67 @@ def is_primarily_chinese(text: str) -> bool:
     return chinese_count > (chinese_count + english_count) * 0.3
 
 
+def _is_paste_line(line: str) -> bool:
+    """Check if a single line looks pasted rather than typed as prose."""
+    return bool(_PASTE_LINE_RE.match(line) or _CODE_LINE_RE.search(line))
+
+
+def looks_like_paste(text: str) -> bool:
+    """
+    Heuristically detect prompts that are mostly pasted technical content.
+
+    In prompts of 3+ lines (or containing a traceback), lines starting with
+    /, $, >, [, whitespace or a traceback header, and lines ending in {, }
+    or ;, are set aside as pasted. Returns True only if what is left, the
+    user's own words, is trivially short:
+    - Fewer than 3 words
+    - Fewer than 40% of its non-space characters are ASCII letters
+
+    Prose next to a paste (an indented list, a question under a quoted
+    reply) is still checked; the API prompt extracts the user's own words.
+    """
+    lines = text.splitlines()
+    if len(lines) >= 3 or 'Traceback (most recent call last)' in text:
+        lines = [line for line in lines if not _is_paste_line(line)]
+    own_text = '\n'.join(lines)
+
+    if len(own_text.split()) < 3:
+        return True
+
+    non_space = len(_NON_SPACE_RE.findall(own_text))
+    if len(_LETTER_RE.findall(own_text)) < non_space * 0.4:
+        return True
+
+    return False
+
+
 def should_check_grammar(text: str) -> bool:
     """
     Determine if text should be checked for grammar.
 
-    Returns False if:
+    Checks run cheapest first. Returns False if:
     - Text is empty
     - Text starts with / (slash command)
-    - Text is pure Chinese
-    - Text is primarily Chinese (>30% Chinese)
-    - Text has no English content
     - Text is too short (< 3 words)
+    - Text has no English content (also covers pure Chinese)
+    - Text is primarily Chinese (>30% Chinese)
     """
-    if not text or not text.strip():
+    stripped = text.strip() if text else ""
+    if not stripped:
         return False
 
     # Skip slash commands (e.g., /english-buddy:stats)
-    if text.strip().startswith('/'):
+    if stripped.startswith('/'):
         return False
 
-    if is_pure_chinese(text):
-        return False
-
-    if is_primarily_chinese(text):
+    # Skip very short messages
+    if len(stripped.split()) < 3:
         return False
 
-    if not contains_english(text):
+    if not _ENGLISH_RE.search(text):
         return False
 
-    # Skip very short messages
-    words = text.split()
-    if len(words) < 3:
+    if is_primarily_chinese(text):
         return False
 
     return True
@@ -100,7 +129,23 @@ if __name__ == "__main__":
         ("/commit", False),  # Slash command
     ]
 
+    paste_cases = [
+        ("Can you help me fix this bug in the login page?", False),
+        ("Traceback (most recent call last):\n  File \"a.py\", line 1\nwhy?", True),
+        ("$ npm install\n$ npm run build\n> build failed\nany idea?", True),
+        ("fix this\nint a = 1;\nint b = 2;\nreturn a + b;", True),
+        ("see 0x7f3a0000 0x1b2c0000 12:34:56.789 404", True),
+        # Own prose next to paste-like lines is still checked
+        ("I think we should:\n    1. refactor the parser\n    2. add more tests\n    3. ship it", False),
+        ("> Let's merge this today.\n> The tests pass.\nDo you thinks it is ready for release?", False),
+    ]
+
     for text, expected in test_cases:
         result = should_check_grammar(text)
         status = "✓" if result == expected else "✗"
         print(f"{status} '{text}' -> {result} (expected {expected})")
+
+    for text, expected in paste_cases:
+        result = looks_like_paste(text)
+        status = "✓" if result == expected else "✗"
+        print(f"{status} looks_like_paste({text[:30]!r}) -> {result} (expected {expected})")
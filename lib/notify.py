@@ -0,0 +1,136 @@
+"""
+macOS notifications for English Buddy.
+Fire-and-forget: callers never wait for the notifier to finish.
+"""
+
+import atexit
+import subprocess
+import sys
+from datetime import date
+
+from obsidian import OBSIDIAN_PATH
+
+
+TERMINAL_NOTIFIER = '/opt/homebrew/bin/terminal-notifier'
+
+# (date, click action) of the last notification. Rebuilt when the date
+# changes rather than frozen at import, since the daemon outlives midnight.
+_CLICK_ACTION = (None, None)
+
+
+def _click_action() -> str:
+    """Get the command that opens today's Obsidian log."""
+    global _CLICK_ACTION
+    today = date.today()
+    if _CLICK_ACTION[0] != today:
+        obsidian_file = OBSIDIAN_PATH / f"{today.isoformat()}.md"
+        _CLICK_ACTION = (today, f"open '{obsidian_file}'")
+    return _CLICK_ACTION[1]
+
+
+def _applescript_string(text: str) -> str:
+    """
+    Quote text as a single-line AppleScript string literal.
+
+    Line breaks are escaped too: `osascript -i` runs each input line as
+    its own statement, so a raw newline would split the command.
+    """
+    escaped = (
+        text.replace('\\', '\\\\')
+        .replace('"', '\\"')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+    return '"' + escaped + '"'
+
+
+def _notification_script(title: str, message: str) -> str:
+    """Build the one-line AppleScript that displays a notification."""
+    return (
+        f"display notification {_applescript_string(message)} "
+        f"with title {_applescript_string(title)}\n"
+    )
+
+
+def _spawn(args: list, **kwargs) -> subprocess.Popen:
+    """Start a detached child process without waiting for it."""
+    return subprocess.Popen(
+        args,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        **kwargs
+    )
+
+
+# Long-lived `osascript -i` used when terminal-notifier is missing, so a
+# run that notifies several times starts osascript only once
+_OSA_PROC = None
+
+
+def _close_osascript():
+    """
+    Close the co-process's stdin at exit.
+
+    osascript then runs whatever is still queued and exits on its own, so
+    a notification sent just before a short-lived hook exits is delivered.
+    """
+    if _OSA_PROC is not None and _OSA_PROC.stdin:
+        try:
+            _OSA_PROC.stdin.close()
+        except OSError:
+            pass
+
+
+atexit.register(_close_osascript)
+
+
+def _run_applescript(script: str):
+    """Send one line of AppleScript to the osascript co-process."""
+    global _OSA_PROC
+    data = script.encode('utf-8')
+    for _ in range(2):
+        if _OSA_PROC is None or _OSA_PROC.poll() is not None:
+            _OSA_PROC = _spawn(['osascript', '-i'], stdin=subprocess.PIPE)
+        try:
+            _OSA_PROC.stdin.write(data)
+            _OSA_PROC.stdin.flush()
+            return
+        except (BrokenPipeError, ValueError):
+            # The co-process died; start a fresh one and try once more
+            _OSA_PROC = None
+
+
+def send_notification(title: str, message: str, group: str = 'english-buddy'):
+    """
+    Send macOS system notification using terminal-notifier.
+
+    Falls back to osascript, then to silence. Clicking the notification
+    opens today's Obsidian log.
+    """
+    try:
+        _spawn([
+            TERMINAL_NOTIFIER,
+            '-title', title,
+            '-message', message,
+            '-group', group,
+            '-sender', 'com.apple.Terminal',
+            '-execute', _click_action()
+        ], stdin=subprocess.DEVNULL)
+    except FileNotFoundError:
+        # terminal-notifier not installed, try osascript. The script goes in
+        # on stdin so quotes in the message cannot break out of the string.
+        try:
+            _run_applescript(_notification_script(title, message))
+        except Exception:
+            pass
+    except Exception as e:
+        print(f"Notification error: {e}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    # Test: multi-line text must stay a single osascript statement
+    script = _notification_script('Title\r\n"quoted"', 'line one\nline two\\')
+    assert script.count('\n') == 1 and script.endswith('\n'), script
+    print(f"Script: {script.rstrip()}")
+    send_notification("English Buddy", "Test notification\nsecond line")
@@ -3,6 +3,7 @@ Obsidian file operations for English Buddy.
 Saves grammar corrections to daily markdown files.
 """
 
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -11,10 +12,16 @@ from typing import Optional
 # Default Obsidian path
 OBSIDIAN_PATH = Path.home() / "obsidian" / "learning" / "english"
 
+# Set once the directory is known to exist, so mkdir runs once per process
+_PATH_READY = False
+
 
 def get_obsidian_path() -> Path:
     """Get the Obsidian path, creating if needed."""
-    OBSIDIAN_PATH.mkdir(parents=True, exist_ok=True)
+    global _PATH_READY
+    if not _PATH_READY:
+        OBSIDIAN_PATH.mkdir(parents=True, exist_ok=True)
+        _PATH_READY = True
     return OBSIDIAN_PATH
 
 
@@ -25,6 +32,34 @@ def get_daily_file_path(target_date: Optional[str] = None) -> Path:
     return get_obsidian_path() / f"{target_date}.md"
 
 
+def _format_entry(user_message: str, analysis: dict, timestamp: str) -> str:
+    """Render one correction record as a markdown section."""
+    # Use extracted user_text if available
+    display_text = analysis.get('user_text') or user_message
+
+    # Every part ends with its own newline so entries are separated consistently
+    parts = [
+        f"\n## {timestamp}\n\n",
+        f"**Original:** {display_text}\n\n",
+    ]
+
+    if analysis.get('has_errors') and analysis.get('errors'):
+        parts.append("**Errors:**\n")
+        for err in analysis['errors']:
+            category = err.get('category', 'grammar')
+            parts.append(f"- \"{err['original']}\" → \"{err['correction']}\" ({err.get('explanation', '')} [{category}])\n")
+        parts.append("\n")
+
+    if analysis.get('better_expression'):
+        parts.append(f"**Better:** {analysis['better_expression']}\n\n")
+
+    if analysis.get('summary'):
+        parts.append(f"> {analysis['summary']}\n\n")
+
+    parts.append("---\n")
+    return ''.join(parts)
+
+
 def save_correction(
     user_message: str,
     analysis: dict,
@@ -41,31 +76,41 @@ def save_correction(
     file_path = get_daily_file_path(target_date)
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
 
-    # Use extracted user_text if available
-    display_text = analysis.get('user_text') or user_message
-
-    lines = []
-    lines.append(f"\n## {timestamp}\n")
-    lines.append(f"**Original:** {display_text}\n")
+    try:
+        with open(file_path, 'a', encoding='utf-8') as f:
+            f.write(_format_entry(user_message, analysis, timestamp))
+        return True
+    except Exception as e:
+        print(f"Failed to save to Obsidian: {e}", file=__import__('sys').stderr)
+        return False
 
-    if analysis.get('has_errors') and analysis.get('errors'):
-        lines.append("\n**Errors:**")
-        for err in analysis['errors']:
-            category = err.get('category', 'grammar')
-            lines.append(f"- \"{err['original']}\" → \"{err['correction']}\" ({err.get('explanation', '')} [{category}])")
-        lines.append("")
 
-    if analysis.get('better_expression'):
-        lines.append(f"\n**Better:** {analysis['better_expression']}\n")
+def save_corrections_bulk(
+    entries: list,
+    target_date: Optional[str] = None
+):
+    """
+    Append many correction records to the daily file in one write.
 
-    if analysis.get('summary'):
-        lines.append(f"\n> {analysis['summary']}\n")
+    Args:
+        entries: List of (user_message, analysis) tuples
+        target_date: Optional date string (YYYY-MM-DD), defaults to today
+    """
+    if not entries:
+        return True
 
-    lines.append("\n---")
+    file_path = get_daily_file_path(target_date)
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+    content = ''.join(
+        _format_entry(user_message, analysis, timestamp)
+        for user_message, analysis in entries
+    )
 
     try:
         with open(file_path, 'a', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
         return True
     except Exception as e:
         print(f"Failed to save to Obsidian: {e}", file=__import__('sys').stderr)
@@ -74,10 +119,10 @@ def save_correction(
 
 def read_daily_file(target_date: Optional[str] = None) -> str:
     """Read the daily markdown file content."""
-    file_path = get_daily_file_path(target_date)
-    if file_path.exists():
-        return file_path.read_text(encoding='utf-8')
-    return ""
+    try:
+        return get_daily_file_path(target_date).read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return ""
 
 
 if __name__ == "__main__":
@@ -0,0 +1,129 @@
+"""
+Retry queue for English Buddy.
+Failed checks are stored one JSON object per line (JSONL) so the hook
+only ever appends; recall rewrites the file once after retrying.
+"""
+
+import fcntl
+import json
+import sys
+from pathlib import Path
+
+
+# Queue file path
+RETRY_QUEUE_PATH = Path.home() / ".english-buddy" / "retry_queue.jsonl"
+# Pre-JSONL queue (a single JSON list), migrated on first use
+LEGACY_QUEUE_PATH = Path.home() / ".english-buddy" / "retry_queue.json"
+
+# Only the most recent items are retried
+MAX_ITEMS = 50
+# Trim the file back to MAX_ITEMS once it grows past this many bytes
+_COMPACT_BYTES = 64 * 1024
+
+
+def _encode(items: list) -> bytes:
+    """Serialize items as JSONL."""
+    return b"".join(
+        json.dumps(item, ensure_ascii=False).encode("utf-8") + b"\n"
+        for item in items
+    )
+
+
+def _decode(data: bytes) -> list:
+    """Parse JSONL, skipping blank or corrupt lines."""
+    items = []
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        try:
+            items.append(json.loads(line))
+        except ValueError:
+            continue
+    return items
+
+
+def _migrate_legacy():
+    """Move items from the old retry_queue.json into the JSONL file."""
+    if not LEGACY_QUEUE_PATH.exists():
+        return
+    RETRY_QUEUE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(RETRY_QUEUE_PATH, 'a+b') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        # Another process may have migrated while we waited for the lock
+        try:
+            with open(LEGACY_QUEUE_PATH, 'r', encoding='utf-8') as legacy_file:
+                legacy = json.load(legacy_file)
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, IOError):
+            legacy = []
+
+        if legacy:
+            # Legacy items are older than anything already appended
+            f.seek(0)
+            newer = f.read()
+            f.seek(0)
+            f.truncate()
+            f.write(_encode(legacy[-MAX_ITEMS:]) + newer)
+        LEGACY_QUEUE_PATH.unlink()
+
+
+def _rewrite(f, items: list):
+    """Replace the contents of a locked queue file with items."""
+    # Rewrite in place (not via rename or unlink) so concurrent appenders,
+    # which lock this same file, then append after it
+    f.seek(0)
+    f.truncate()
+    f.write(_encode(items))
+
+
+def append_item(item: dict):
+    """Append one failed check to the queue."""
+    _migrate_legacy()
+    RETRY_QUEUE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(RETRY_QUEUE_PATH, 'a+b') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        f.write(_encode([item]))
+
+        # Keep the file bounded even if recall never runs. Done under the
+        # same lock; recall removes items by value, so trimming cannot
+        # invalidate anything it has already loaded
+        if f.tell() > _COMPACT_BYTES:
+            f.seek(0)
+            _rewrite(f, _decode(f.read())[-MAX_ITEMS:])
+
+
+def load_queue() -> list:
+    """Load the queued items (the last MAX_ITEMS)."""
+    _migrate_legacy()
+    try:
+        with open(RETRY_QUEUE_PATH, 'rb') as f:
+            fcntl.flock(f, fcntl.LOCK_SH)
+            data = f.read()
+    except FileNotFoundError:
+        return []
+    return _decode(data)[-MAX_ITEMS:]
+
+
+def remove_items(done: list):
+    """
+    Remove finished items from the queue.
+
+    Items are matched by value against the file as it is now, so lines
+    appended or trimmed by the hook since load_queue() are handled. The
+    file is left empty once the queue is empty.
+    """
+    if not done:
+        return
+    try:
+        with open(RETRY_QUEUE_PATH, 'r+b') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            remaining = _decode(f.read())
+            for item in done:
+                if item in remaining:
+                    remaining.remove(item)
+            _rewrite(f, remaining[-MAX_ITEMS:])
+    except FileNotFoundError:
+        pass
+    except IOError as e:
+        print(f"Failed to update retry queue: {e}", file=sys.stderr)
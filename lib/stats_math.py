@@ -0,0 +1,20 @@
+"""
+Small statistics helpers for English Buddy reports.
+"""
+
+
+def compute_changes(curr: list, prev: list) -> list:
+    """
+    Compute percent changes between two parallel lists of counts.
+
+    Args:
+        curr: Counts for the current period
+        prev: Counts for the previous period, same order as curr
+
+    Returns:
+        List of percent changes; None where prev is 0 (no baseline)
+    """
+    return [
+        ((c - p) / p) * 100 if p > 0 else None
+        for c, p in zip(curr, prev)
+    ]
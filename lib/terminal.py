@@ -0,0 +1,28 @@
+"""
+Terminal output helpers for English Buddy.
+Reports are built as lists of lines and written to stdout in one call.
+"""
+
+import os
+import sys
+
+
+def write_lines(lines: list):
+    """
+    Write lines to stdout as a single UTF-8 write.
+
+    Output is the same as calling print() once per line. If the reader
+    goes away (e.g. piped into head), exit quietly instead of printing a
+    BrokenPipeError traceback.
+    """
+    data = ("\n".join(lines) + "\n").encode("utf-8")
+    try:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(data)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Point stdout at devnull so the interpreter's final flush
+        # does not raise again on the closed pipe
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
@@ -0,0 +1,13 @@
+"""
+Shared startup for English Buddy scripts.
+Puts lib/ on sys.path once, so every script imports lib modules the same way.
+"""
+
+import sys
+from pathlib import Path
+
+
+LIB_DIR = str(Path(__file__).resolve().parent.parent / "lib")
+
+if LIB_DIR not in sys.path:
+    sys.path.insert(0, LIB_DIR)
@@ -5,18 +5,20 @@ Called by UserPromptSubmit hook to check English grammar.
 """
 
 import json
-import subprocess
+import socket
 import sys
 from datetime import datetime
 from pathlib import Path
 
-# Add lib to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+import _bootstrap  # noqa: F401  (puts lib/ on sys.path)
 
-# Retry queue file path
-RETRY_QUEUE_PATH = Path.home() / ".english-buddy" / "retry_queue.json"
 # Last successful check file path
 LAST_CHECK_PATH = Path.home() / ".english-buddy" / "last_check.json"
+# How long a cached analysis is reused for an identical prompt
+ANALYSIS_CACHE_TTL = 7 * 24 * 3600
+# Unix socket of the optional long-running daemon (scripts/daemon.py)
+DAEMON_SOCKET_PATH = Path.home() / ".english-buddy" / "daemon.sock"
+DAEMON_CONNECT_TIMEOUT = 2
 
 
 def save_last_check(user_prompt: str, analysis: dict, notification_message: str):
@@ -33,105 +35,77 @@ def save_last_check(user_prompt: str, analysis: dict, notification_message: str)
 
 def save_to_retry_queue(user_prompt: str, reason: str):
     """Save a failed message to retry queue for later recall."""
-    RETRY_QUEUE_PATH.parent.mkdir(parents=True, exist_ok=True)
-
-    # Load existing queue
-    queue = []
-    if RETRY_QUEUE_PATH.exists():
-        try:
-            with open(RETRY_QUEUE_PATH, 'r') as f:
-                queue = json.load(f)
-        except (json.JSONDecodeError, IOError):
-            queue = []
-
-    # Add new item
-    queue.append({
+    from retry_queue import append_item
+
+    append_item({
         "prompt": user_prompt,
         "reason": reason,
         "timestamp": datetime.now().isoformat()
     })
 
-    # Keep only last 50 items to prevent unbounded growth
-    queue = queue[-50:]
 
-    # Save queue
-    with open(RETRY_QUEUE_PATH, 'w') as f:
-        json.dump(queue, f, indent=2, ensure_ascii=False)
+from language_detect import should_check_grammar, looks_like_paste
 
-from language_detect import should_check_grammar
-from claude_api import analyze_grammar
-from obsidian import save_correction as save_to_obsidian
-from db import save_correction as save_to_db
 
+def check_prompt(user_prompt: str):
+    """
+    Analyze a prompt that passed the local filters, then save and notify.
 
-def send_notification(title: str, message: str):
-    """Send macOS system notification using terminal-notifier."""
-    try:
-        # Get today's Obsidian file path for click action
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        obsidian_file = Path.home() / "obsidian" / "learning" / "english" / f"{date_str}.md"
-
-        subprocess.run(
-            [
-                '/opt/homebrew/bin/terminal-notifier',
-                '-title', title,
-                '-message', message,
-                '-group', 'english-buddy',
-                '-sender', 'com.apple.Terminal',
-                '-execute', f"open '{obsidian_file}'"
-            ],
-            capture_output=True,
-            timeout=5
-        )
-    except FileNotFoundError:
-        # terminal-notifier not installed, try osascript
-        try:
-            subprocess.run([
-                'osascript', '-e',
-                f'display notification "{message}" with title "{title}"'
-            ], capture_output=True, timeout=5)
-        except Exception:
-            pass
-    except Exception as e:
-        print(f"Notification error: {e}", file=sys.stderr)
+    Runs in the hook process, or in the daemon when one is listening.
+    """
+    # Imported here so prompts rejected by the filters never load them
+    from concurrent.futures import ThreadPoolExecutor
+    from claude_api import analyze_grammar, is_valid_analysis
+    from obsidian import save_correction as save_to_obsidian
+    from db import save_correction as save_to_db
+    from cache import cache_key, load_cached, prune_cached, save_cached
+    from notify import send_notification
 
-
-def main():
-    """Main entry point for UserPromptSubmit hook."""
     try:
-        # Read input from stdin
-        input_data = json.load(sys.stdin)
-
-        user_prompt = input_data.get('prompt', '') or input_data.get('user_prompt', '')
-
-        # Check if we should analyze this text
-        if not should_check_grammar(user_prompt):
-            print(json.dumps({}), file=sys.stdout)
-            sys.exit(0)
-
-        # Call Claude API for analysis
-        analysis = analyze_grammar(user_prompt)
+        # Reuse the analysis of an identical prompt, otherwise call Claude API
+        cache_name = f"analysis-{cache_key(user_prompt)}"
+        analysis = load_cached(cache_name, ANALYSIS_CACHE_TTL)
+        if not is_valid_analysis(analysis):
+            # Missing, or a partial analysis cached before replies were validated
+            analysis = analyze_grammar(user_prompt)
+            if analysis is not None:
+                save_cached(cache_name, analysis)
+                # Expired analyses are never read again; drop them on write
+                prune_cached("analysis-", ANALYSIS_CACHE_TTL)
 
         if analysis is None:
             # API call failed, save to retry queue
             save_to_retry_queue(user_prompt, "API call failed")
-            print(json.dumps({}), file=sys.stdout)
-            sys.exit(0)
-
-        if analysis:
-            # Skip if marked as technical content
-            if analysis.get('skipped'):
-                print(json.dumps({}), file=sys.stdout)
-                sys.exit(0)
-
-            # Save to Obsidian and SQLite if there are findings
-            if analysis.get('has_errors') or analysis.get('better_expression'):
+            return
+
+        # Skip if marked as technical content
+        if not analysis or analysis.get('skipped'):
+            return
+
+        # Save to Obsidian and SQLite if there are findings
+        if analysis.get('has_errors') or analysis.get('better_expression'):
+            errors = analysis.get('errors', [])
+
+            # Build notification message
+            notif_parts = []
+            if errors:
+                for err in errors[:2]:  # Max 2 errors in notification
+                    notif_parts.append(f"「{err['original']}」→「{err['correction']}」")
+            if analysis.get('better_expression') and not notif_parts:
+                better = analysis['better_expression']
+                if len(better) > 50:
+                    better = better[:47] + "..."
+                notif_parts.append(f"Better: {better}")
+            notif_message = " | ".join(notif_parts)
+
+            # Obsidian and SQLite are independent I/O
+            with ThreadPoolExecutor(max_workers=2) as executor:
                 # Save to Obsidian (markdown)
-                save_to_obsidian(user_prompt, analysis)
+                obsidian_future = executor.submit(save_to_obsidian, user_prompt, analysis)
 
                 # Save to SQLite (for statistics)
-                errors = analysis.get('errors', [])
-                save_to_db(
+                db_future = executor.submit(
+                    save_to_db,
                     original_text=user_prompt,
                     user_text=analysis.get('user_text', user_prompt),
                     errors=errors,
@@ -139,38 +113,63 @@ def main():
                     summary=analysis.get('summary')
                 )
 
-                # Build notification message
-                notif_parts = []
-                if errors:
-                    for err in errors[:2]:  # Max 2 errors in notification
-                        notif_parts.append(f"「{err['original']}」→「{err['correction']}」")
-                if analysis.get('better_expression') and not notif_parts:
-                    better = analysis['better_expression']
-                    if len(better) > 50:
-                        better = better[:47] + "..."
-                    notif_parts.append(f"Better: {better}")
-
-                if notif_parts:
-                    notif_message = " | ".join(notif_parts)
+                # Fire-and-forget, so it can go out while the saves run
+                if notif_message:
                     send_notification("English Buddy", notif_message)
-                    save_last_check(user_prompt, analysis, notif_message)
 
-        # Output empty JSON to stdout (hook response)
-        print(json.dumps({}), file=sys.stdout)
+                obsidian_future.result()
+                db_future.result()
+
+            if notif_message:
+                save_last_check(user_prompt, analysis, notif_message)
+
+    except Exception as e:
+        # Log error and keep the prompt for a later recall
+        print(f"Grammar check error: {e}", file=sys.stderr)
+        save_to_retry_queue(user_prompt, str(e))
+
+
+def forward_to_daemon(user_prompt: str) -> bool:
+    """
+    Hand the prompt to a running daemon (see daemon.py).
+
+    Returns True once the daemon has accepted it, False if no daemon is
+    listening, in which case the caller checks the prompt itself.
+    """
+    if not DAEMON_SOCKET_PATH.exists():
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(DAEMON_CONNECT_TIMEOUT)
+            sock.connect(str(DAEMON_SOCKET_PATH))
+            sock.sendall(json.dumps({"prompt": user_prompt}, ensure_ascii=False).encode('utf-8') + b"\n")
+            reply = sock.makefile('rb').readline()
+        return bool(reply) and json.loads(reply).get("ok", False)
+    except (OSError, ValueError):
+        return False
+
+
+def main():
+    """Main entry point for UserPromptSubmit hook."""
+    try:
+        # Read input from stdin
+        input_data = json.load(sys.stdin)
+
+        user_prompt = input_data.get('prompt', '') or input_data.get('user_prompt', '')
+
+        # Check if we should analyze this text; skip mostly-pasted content
+        # locally instead of paying for an API call
+        if should_check_grammar(user_prompt) and not looks_like_paste(user_prompt):
+            if not forward_to_daemon(user_prompt):
+                check_prompt(user_prompt)
 
     except Exception as e:
         # Log error but don't block the conversation
         print(f"Grammar check error: {e}", file=sys.stderr)
-        # Save to retry queue if we have user_prompt
-        try:
-            if user_prompt:
-                save_to_retry_queue(user_prompt, str(e))
-        except NameError:
-            pass
-        print(json.dumps({}), file=sys.stdout)
-
-    finally:
-        sys.exit(0)
+
+    # Output empty JSON to stdout (hook response)
+    print(json.dumps({}), file=sys.stdout)
+    sys.exit(0)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Daemon Script for English Buddy.
+Keeps the Anthropic client and SQLite connection warm between prompts.
+
+The hook (check_grammar.py) forwards prompts over a Unix socket when this
+daemon is running, so it no longer pays Python startup, the anthropic
+import and a TLS handshake on every message. Without the daemon the hook
+checks prompts itself, exactly as before.
+"""
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+
+import _bootstrap  # noqa: F401  (puts lib/ on sys.path)
+
+from check_grammar import DAEMON_SOCKET_PATH, check_prompt
+from db import get_connection
+
+# Checks share one SQLite connection, so run them one at a time
+_CHECK_LOCK = threading.Lock()
+
+
+class PromptHandler(socketserver.StreamRequestHandler):
+    """Accept one JSON line {"prompt": ...}, acknowledge, then check it."""
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            # Liveness probe from is_running(), or the client went away
+            return
+
+        try:
+            request = json.loads(line)
+            user_prompt = request.get('prompt', '')
+        except (ValueError, AttributeError):
+            self.wfile.write(b'{"ok": false}\n')
+            return
+
+        # Acknowledge first so the hook can return without waiting for the API
+        self.wfile.write(b'{"ok": true}\n')
+        self.wfile.flush()
+
+        with _CHECK_LOCK:
+            check_prompt(user_prompt)
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def is_running() -> bool:
+    """Check whether another daemon is already listening on the socket."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(DAEMON_SOCKET_PATH))
+        return True
+    except OSError:
+        return False
+
+
+def main():
+    """Main entry point for the daemon."""
+    if is_running():
+        print(f"English Buddy daemon already running at {DAEMON_SOCKET_PATH}")
+        return
+
+    # Remove a stale socket left by a previous run
+    DAEMON_SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+    if DAEMON_SOCKET_PATH.exists():
+        DAEMON_SOCKET_PATH.unlink()
+
+    # Warm up the database connection and the anthropic import
+    get_connection()
+    try:
+        import anthropic  # noqa: F401
+    except ImportError:
+        print("Warning: anthropic package not installed", file=sys.stderr)
+
+    # Socket is created owner-only: prompts may contain private text
+    old_umask = os.umask(0o177)
+    try:
+        server = DaemonServer(str(DAEMON_SOCKET_PATH), PromptHandler)
+    finally:
+        os.umask(old_umask)
+    print(f"English Buddy daemon listening on {DAEMON_SOCKET_PATH}")
+
+    # Exit through the finally block below on SIGTERM too
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if DAEMON_SOCKET_PATH.exists():
+            DAEMON_SOCKET_PATH.unlink()
+
+
+if __name__ == '__main__':
+    main()
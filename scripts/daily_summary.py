@@ -4,18 +4,18 @@ Daily Summary Script for English Buddy.
 Shows today's grammar corrections summary.
 """
 
-import sys
 from datetime import datetime
-from pathlib import Path
 
-# Add lib to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+import _bootstrap  # noqa: F401  (puts lib/ on sys.path)
 
 from db import get_daily_stats, get_daily_corrections, get_top_errors
+from terminal import write_lines
 
 
-def main():
-    """Generate and print daily summary."""
+def build_report() -> list:
+    """Build the daily summary report."""
+    out = []
+
     today = datetime.now().strftime("%Y-%m-%d")
 
     # Get today's stats
@@ -24,43 +24,51 @@ def main():
     top_errors = get_top_errors(limit=5, days=1)
 
     # Header
-    print(f"\n📊 Daily Summary - {today}")
-    print("━" * 35)
+    out.append(f"\n📊 Daily Summary - {today}")
+    out.append("━" * 35)
 
     # Stats overview
     total = stats["total_corrections"]
     if total == 0:
-        print("\n✨ No corrections today! Keep practicing!")
-        print("\nTip: The more you write in English, the more you'll learn.")
-        return
+        out.append("\n✨ No corrections today! Keep practicing!")
+        out.append("\nTip: The more you write in English, the more you'll learn.")
+        return out
 
-    print(f"\nTotal corrections: {total}")
-    print(f"  • Spelling:   {stats['spelling_count']}")
-    print(f"  • Grammar:    {stats['grammar_count']}")
-    print(f"  • Style:      {stats['style_count']}")
-    print(f"  • Vocabulary: {stats['vocabulary_count']}")
+    out.append(f"\nTotal corrections: {total}")
+    out.append(f"  • Spelling:   {stats['spelling_count']}")
+    out.append(f"  • Grammar:    {stats['grammar_count']}")
+    out.append(f"  • Style:      {stats['style_count']}")
+    out.append(f"  • Vocabulary: {stats['vocabulary_count']}")
 
     # Top errors
     if top_errors:
-        print("\n📝 Most common mistakes today:")
+        out.append("\n📝 Most common mistakes today:")
         for i, err in enumerate(top_errors, 1):
-            print(f"  {i}. \"{err['original']}\" → \"{err['correction']}\" ({err['count']}x)")
+            out.append(f"  {i}. \"{err['original']}\" → \"{err['correction']}\" ({err['count']}x)")
 
     # Recent corrections
     if corrections:
-        print("\n📋 Recent corrections:")
+        out.append("\n📋 Recent corrections:")
         for corr in corrections[:3]:
-            time = corr['timestamp'].split('T')[1][:5] if 'T' in corr['timestamp'] else corr['timestamp'][-5:]
+            day, sep, clock = corr['timestamp'].partition('T')
+            time = clock[:5] if sep else day[-5:]
             user_text = corr['user_text'] or corr['original_text']
             if len(user_text) > 50:
                 user_text = user_text[:47] + "..."
-            print(f"  [{time}] {user_text}")
+            out.append(f"  [{time}] {user_text}")
             for err in corr.get('errors', [])[:2]:
-                print(f"         → {err['original']} → {err['correction']}")
+                out.append(f"         → {err['original']} → {err['correction']}")
 
     # Footer
-    print("\n" + "━" * 35)
-    print("📁 Full log: ~/obsidian/learning/english/")
+    out.append("\n" + "━" * 35)
+    out.append("📁 Full log: ~/obsidian/learning/english/")
+
+    return out
+
+
+def main():
+    """Print daily summary."""
+    write_lines(build_report())
 
 
 if __name__ == "__main__":
@@ -5,56 +5,26 @@ Retries failed grammar checks from the retry queue.
 """
 
 import json
-import subprocess
 import sys
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-# Add lib to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+import _bootstrap  # noqa: F401  (puts lib/ on sys.path)
 
 from language_detect import should_check_grammar
 from claude_api import analyze_grammar
-from obsidian import save_correction as save_to_obsidian
-from db import save_correction as save_to_db
+from obsidian import save_corrections_bulk as save_to_obsidian_bulk
+from db import save_corrections_bulk as save_to_db_bulk
+from notify import send_notification
+from retry_queue import load_queue, remove_items
 
-# Retry queue file path
-RETRY_QUEUE_PATH = Path.home() / ".english-buddy" / "retry_queue.json"
 # Last successful check file path
 LAST_CHECK_PATH = Path.home() / ".english-buddy" / "last_check.json"
-
-
-def send_notification(title: str, message: str):
-    """Send macOS system notification using terminal-notifier."""
-    try:
-        # Get today's Obsidian file path for click action
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        obsidian_file = Path.home() / "obsidian" / "learning" / "english" / f"{date_str}.md"
-
-        subprocess.run(
-            [
-                '/opt/homebrew/bin/terminal-notifier',
-                '-title', title,
-                '-message', message,
-                '-group', 'english-buddy-recall',
-                '-sender', 'com.apple.Terminal',
-                '-execute', f"open '{obsidian_file}'"
-            ],
-            capture_output=True,
-            timeout=5
-        )
-    except FileNotFoundError:
-        # terminal-notifier not installed, try osascript
-        try:
-            subprocess.run([
-                'osascript', '-e',
-                f'display notification "{message}" with title "{title}"'
-            ], capture_output=True, timeout=5)
-        except Exception:
-            pass
-    except Exception as e:
-        print(f"Notification error: {e}", file=sys.stderr)
+# Notification group, kept apart from the hook's notifications
+NOTIFICATION_GROUP = 'english-buddy-recall'
+# Concurrent API calls while retrying; kept low to respect rate limits
+MAX_WORKERS = 4
 
 
 def load_last_check() -> dict | None:
@@ -68,60 +38,94 @@ def load_last_check() -> dict | None:
         return None
 
 
-def load_retry_queue() -> list:
-    """Load the retry queue from file."""
-    if not RETRY_QUEUE_PATH.exists():
-        return []
-    try:
-        with open(RETRY_QUEUE_PATH, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
-        return []
-
-
-def save_retry_queue(queue: list):
-    """Save the retry queue to file."""
-    RETRY_QUEUE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(RETRY_QUEUE_PATH, 'w') as f:
-        json.dump(queue, f, indent=2, ensure_ascii=False)
+def process_analysis(user_prompt: str, analysis: dict) -> tuple | None:
+    """
+    Turn a successful analysis result into records to save.
 
-
-def process_analysis(user_prompt: str, analysis: dict) -> bool:
-    """Process a successful analysis result. Returns True if there were findings."""
+    Returns:
+        (obsidian_entry, db_record) if there were findings, otherwise None
+    """
     # Skip if marked as technical content
     if analysis.get('skipped'):
-        return False
+        return None
 
-    # Save to Obsidian and SQLite if there are findings
     if analysis.get('has_errors') or analysis.get('better_expression'):
-        # Save to Obsidian (markdown)
-        save_to_obsidian(user_prompt, analysis)
-
-        # Save to SQLite (for statistics)
-        errors = analysis.get('errors', [])
-        save_to_db(
-            original_text=user_prompt,
-            user_text=analysis.get('user_text', user_prompt),
-            errors=errors,
-            better_expression=analysis.get('better_expression'),
-            summary=analysis.get('summary')
-        )
-        return True
-    return False
+        obsidian_entry = (user_prompt, analysis)
+        db_record = {
+            'original_text': user_prompt,
+            'user_text': analysis.get('user_text', user_prompt),
+            'errors': analysis.get('errors', []),
+            'better_expression': analysis.get('better_expression'),
+            'summary': analysis.get('summary')
+        }
+        return obsidian_entry, db_record
+    return None
+
+
+def analyze_with_retry(user_prompt: str) -> tuple:
+    """
+    Analyze a prompt, retrying once after 2 seconds on failure.
+
+    Returns:
+        (analysis or None, whether the first attempt failed)
+    """
+    analysis = analyze_grammar(user_prompt)
+    if analysis is not None:
+        return analysis, False
+    time.sleep(2)
+    return analyze_grammar(user_prompt), True
+
+
+def analyze_all(prompts: dict) -> dict:
+    """
+    Analyze many prompts concurrently.
+
+    The API calls are network-bound, so threads overlap their round-trips.
+
+    Args:
+        prompts: Dict of {queue index: prompt}
+
+    Returns:
+        Dict of {queue index: analyze_with_retry result}
+    """
+    if not prompts:
+        return {}
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(analyze_with_retry, prompt): index
+            for index, prompt in prompts.items()
+        }
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                print(f"Analysis error: {e}", file=sys.stderr)
+                results[futures[future]] = (None, True)
+    return results
+
+
+def save_findings(obsidian_entries: list, db_records: list):
+    """Save all findings at once: one Obsidian append and one SQLite transaction."""
+    if not db_records:
+        return
+    save_to_obsidian_bulk(obsidian_entries)
+    save_to_db_bulk(db_records)
 
 
 def main():
     """Main entry point for recall script."""
-    queue = load_retry_queue()
+    queue = load_queue()
 
     if not queue:
         # No failed checks - re-notify the last successful check
         last_check = load_last_check()
         if last_check and last_check.get('notification'):
-            send_notification("English Buddy (Recall)", last_check['notification'])
+            send_notification("English Buddy (Recall)", last_check['notification'], group=NOTIFICATION_GROUP)
             print(f"Re-sent last notification: {last_check['notification']}")
         else:
-            send_notification("English Buddy Recall", "No checks to recall")
+            send_notification("English Buddy Recall", "No checks to recall", group=NOTIFICATION_GROUP)
             print("No failed checks and no previous notification to recall.")
         return
 
@@ -129,9 +133,19 @@ def main():
 
     success_count = 0
     still_failed = []
-    findings_count = 0
+    obsidian_entries = []
+    db_records = []
 
-    for item in queue:
+    # Run the API calls concurrently up front, for the prompts worth checking
+    prompts = {}
+    for index, item in enumerate(queue):
+        user_prompt = item.get('prompt', '')
+        if user_prompt and should_check_grammar(user_prompt):
+            prompts[index] = user_prompt
+    results = analyze_all(prompts)
+
+    # Report and collect in queue order; saving stays on this thread
+    for index, item in enumerate(queue):
         user_prompt = item.get('prompt', '')
         if not user_prompt:
             continue
@@ -139,37 +153,35 @@ def main():
         print(f"Retrying: {user_prompt[:50]}...")
 
         # Skip if we shouldn't check this text
-        if not should_check_grammar(user_prompt):
+        if index not in prompts:
             print("  Skipped (not suitable for grammar check)")
             success_count += 1
             continue
 
-        # Try API call (1 retry = 2 total attempts)
-        analysis = None
-        for attempt in range(2):
-            analysis = analyze_grammar(user_prompt)
-            if analysis is not None:
-                break
-            if attempt == 0:
-                print("  First attempt failed, retrying in 2 seconds...")
-                time.sleep(2)
-
+        analysis, retried = results[index]
         if analysis is None:
             print("  Still failed after retry")
             still_failed.append(item)
             continue
+        if retried:
+            print("  First attempt failed, succeeded on retry")
 
-        # Process successful analysis
-        had_findings = process_analysis(user_prompt, analysis)
+        # Collect findings; they are saved together after the loop
+        findings = process_analysis(user_prompt, analysis)
         success_count += 1
-        if had_findings:
-            findings_count += 1
+        if findings:
+            obsidian_entries.append(findings[0])
+            db_records.append(findings[1])
             print("  Success (found issues)")
         else:
             print("  Success (no issues)")
 
-    # Update the queue with only still-failed items
-    save_retry_queue(still_failed)
+    save_findings(obsidian_entries, db_records)
+    findings_count = len(db_records)
+
+    # Drop everything that no longer needs a retry
+    failed_ids = {id(item) for item in still_failed}
+    remove_items([item for item in queue if id(item) not in failed_ids])
 
     # Send notification with results
     if still_failed:
@@ -179,7 +191,7 @@ def main():
         if findings_count > 0:
             msg += f" ({findings_count} with findings)"
 
-    send_notification("English Buddy Recall", msg)
+    send_notification("English Buddy Recall", msg, group=NOTIFICATION_GROUP)
     print(f"\nDone: {msg}")
 
 
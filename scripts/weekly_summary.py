@@ -4,94 +4,94 @@ Weekly Summary Script for English Buddy.
 Shows weekly grammar progress and trends.
 """
 
-import sys
-from datetime import datetime
-from pathlib import Path
+import _bootstrap  # noqa: F401  (puts lib/ on sys.path)
 
-# Add lib to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+from db import CATEGORIES, get_top_category, get_top_errors, get_week_pair_stats
+from stats_math import compute_changes
+from terminal import write_lines
 
-from db import get_weekly_stats, get_top_errors
 
+def build_report() -> list:
+    """Build the weekly summary report."""
+    out = []
 
-def main():
-    """Generate and print weekly summary."""
-    # Get current week stats
-    current_week = get_weekly_stats(weeks_back=0)
-    last_week = get_weekly_stats(weeks_back=1)
+    # Get this week's and last week's stats in one query
+    weeks = get_week_pair_stats()
     top_errors = get_top_errors(limit=5, days=7)
 
     # Header
-    print(f"\n📊 Weekly Summary")
-    print(f"   {current_week['week_start']} to {current_week['week_end']}")
-    print("━" * 40)
+    out.append(f"\n📊 Weekly Summary")
+    out.append(f"   {weeks['curr_week_start']} to {weeks['curr_week_end']}")
+    out.append("━" * 40)
 
     # Stats overview
-    total = current_week["total_corrections"]
+    total = weeks["curr_total_corrections"]
     if total == 0:
-        print("\n✨ No corrections this week!")
-        print("Keep writing in English to track your progress.")
-        return
+        out.append("\n✨ No corrections this week!")
+        out.append("Keep writing in English to track your progress.")
+        return out
 
-    print(f"\nThis week: {total} corrections")
-    print(f"  • Spelling:   {current_week['spelling_count']}")
-    print(f"  • Grammar:    {current_week['grammar_count']}")
-    print(f"  • Style:      {current_week['style_count']}")
-    print(f"  • Vocabulary: {current_week['vocabulary_count']}")
+    out.append(f"\nThis week: {total} corrections")
+    out.append(f"  • Spelling:   {weeks['curr_spelling_count']}")
+    out.append(f"  • Grammar:    {weeks['curr_grammar_count']}")
+    out.append(f"  • Style:      {weeks['curr_style_count']}")
+    out.append(f"  • Vocabulary: {weeks['curr_vocabulary_count']}")
 
     # Week-over-week comparison
-    last_total = last_week["total_corrections"]
+    last_total = weeks["prev_total_corrections"]
     if last_total > 0:
-        print(f"\n📈 Week-over-Week Comparison:")
-        print(f"   Last week: {last_total} corrections")
+        out.append(f"\n📈 Week-over-Week Comparison:")
+        out.append(f"   Last week: {last_total} corrections")
 
         diff = total - last_total
         if diff < 0:
-            print(f"   Change: {diff} fewer errors! 🎉")
+            out.append(f"   Change: {diff} fewer errors! 🎉")
         elif diff > 0:
-            print(f"   Change: +{diff} more errors (more practice!)")
+            out.append(f"   Change: +{diff} more errors (more practice!)")
         else:
-            print(f"   Change: Same as last week")
+            out.append(f"   Change: Same as last week")
 
         # Category comparison
-        for cat in ['spelling', 'grammar', 'style', 'vocabulary']:
-            curr = current_week[f'{cat}_count']
-            prev = last_week[f'{cat}_count']
-            if prev > 0:
-                change = ((curr - prev) / prev) * 100
-                if abs(change) > 20:
-                    arrow = "↓" if change < 0 else "↑"
-                    print(f"   {cat.capitalize()}: {arrow} {abs(change):.0f}%")
+        changes = compute_changes(
+            [weeks[f'curr_{cat}_count'] for cat in CATEGORIES],
+            [weeks[f'prev_{cat}_count'] for cat in CATEGORIES]
+        )
+        for cat, change in zip(CATEGORIES, changes):
+            if change is not None and abs(change) > 20:
+                arrow = "↓" if change < 0 else "↑"
+                out.append(f"   {cat.capitalize()}: {arrow} {abs(change):.0f}%")
 
     # Top errors this week
     if top_errors:
-        print("\n📝 Top mistakes this week:")
+        out.append("\n📝 Top mistakes this week:")
         for i, err in enumerate(top_errors, 1):
-            print(f"  {i}. \"{err['original']}\" → \"{err['correction']}\"")
-            print(f"     [{err['category']}] occurred {err['count']} times")
+            out.append(f"  {i}. \"{err['original']}\" → \"{err['correction']}\"")
+            out.append(f"     [{err['category']}] occurred {err['count']} times")
 
     # Recommendations
-    print("\n💡 Focus areas:")
-    max_cat = max(
-        [('spelling', current_week['spelling_count']),
-         ('grammar', current_week['grammar_count']),
-         ('style', current_week['style_count']),
-         ('vocabulary', current_week['vocabulary_count'])],
-        key=lambda x: x[1]
-    )
-    if max_cat[1] > 0:
+    out.append("\n💡 Focus areas:")
+    top_category = get_top_category(weeks['curr_week_start'], weeks['curr_week_end'])
+    if top_category:
+        category = top_category[0]
         tips = {
             'spelling': "Try typing more slowly and proofreading before sending.",
             'grammar': "Review basic grammar rules: articles, tenses, subject-verb agreement.",
             'style': "Read more native English content to absorb natural expressions.",
             'vocabulary': "Keep a vocabulary journal for commonly confused words."
         }
-        print(f"  Your main challenge: {max_cat[0].capitalize()}")
-        print(f"  Tip: {tips[max_cat[0]]}")
+        out.append(f"  Your main challenge: {category.capitalize()}")
+        out.append(f"  Tip: {tips[category]}")
 
     # Footer
-    print("\n" + "━" * 40)
-    print("Run /english-buddy:stats for detailed charts")
+    out.append("\n" + "━" * 40)
+    out.append("Run /english-buddy:stats for detailed charts")
+
+    return out
+
+
+def main():
+    """Print weekly summary."""
+    write_lines(build_report())
 
 
 if __name__ == "__main__":